@@ -1,16 +1,25 @@
 # chart_dialog.py
 import sys
+import numpy as np
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QComboBox
 )
 # For Matplotlib integration
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
+
+_NUMERIC = (int, float, np.number)
+_BOOLEAN = (bool, np.bool_)
+
+# Above this many tests, bars are averaged into MAX_BARS buckets (narrower bars are not legible anyway)
+MAX_BARS = 200
 
 class MplCanvas(FigureCanvas):
     """A basic canvas widget for a Matplotlib figure."""
     def __init__(self, parent=None, width=5, height=4, dpi=100):
-        fig = Figure(figsize=(width, height), dpi=dpi)
+        # The tight layout engine re-runs on full draws only; blitted updates skip it
+        fig = Figure(figsize=(width, height), dpi=dpi, layout="tight")
         self.axes = fig.add_subplot(111)
         super(MplCanvas, self).__init__(fig)
 
@@ -22,6 +31,16 @@ class ChartDialog(QDialog):
         self.setMinimumSize(800, 600)
         self.data = data_rows
 
+        # Per-metric (labels, values) built in a single pass over the rows
+        self._prepared, self._bucketed = self._preprocess(data_rows)
+        self._plotted_state = None  # (metric, canvas size) currently on screen
+
+        # Persistent artists reused while the X-axis labels stay the same
+        self._bars = None
+        self._bar_labels = None
+        self._title = None
+        self._bg = None  # Cached figure background (everything except the animated artists)
+
         # Main layout
         layout = QVBoxLayout(self)
 
@@ -36,6 +55,9 @@ class ChartDialog(QDialog):
         layout.addWidget(self.canvas)
         self.setLayout(layout)
 
+        # Re-capture the blit background after every full draw
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
         # Populate the ComboBox and connect its signal
         self.populate_metrics()
         self.metric_selector.currentTextChanged.connect(self.update_plot)
@@ -45,15 +67,81 @@ class ChartDialog(QDialog):
 
     def get_available_metrics(self):
         """Finds all calculated metric keys."""
-        keys = set()
-        for row in self.data:
-            keys.update((row.get("metrics") or {}).keys())
-        return sorted(list(keys))
+        return sorted(self._prepared)
 
     def populate_metrics(self):
         """Populates the ComboBox for metric selection."""
         metrics = self.get_available_metrics()
-        self.metric_selector.addItems(metrics)
+        # No currentTextChanged -> update_plot while filling; callers plot once afterwards
+        self.metric_selector.blockSignals(True)
+        try:
+            self.metric_selector.addItems(metrics)
+        finally:
+            self.metric_selector.blockSignals(False)
+
+    @staticmethod
+    def _preprocess(data_rows):
+        """
+        Walks the rows once and returns ({metric: (bar_labels, values)}, bucketed).
+        The X categories are shared by every metric (the same bar_labels list object):
+        `values` is a dense float64 array aligned with them, holding NaN where a row has no numeric value.
+        With more than MAX_BARS tests, consecutive tests are averaged into MAX_BARS buckets.
+        """
+        all_labels = []
+        collected: dict[str, tuple[list, list]] = {}  # metric -> (columns, raw numeric values)
+        for row in data_rows:
+            col = None
+            for metric, metric_val in (row.get("metrics") or {}).items():
+                cols, raw = collected.setdefault(metric, ([], []))
+                # Only numeric values are plotted; booleans (exact_match) and strings are skipped
+                if not isinstance(metric_val, _NUMERIC) or isinstance(metric_val, _BOOLEAN):
+                    continue
+                if col is None:
+                    col = len(all_labels)
+                    all_labels.append(f"ID {row.get('id', '?')}")
+                cols.append(col)
+                raw.append(metric_val)
+
+        # Large result sets: fixed buckets of consecutive tests, shared by every metric
+        starts = None
+        bar_labels = all_labels
+        if len(all_labels) > MAX_BARS:
+            starts = np.array([chunk[0] for chunk in np.array_split(np.arange(len(all_labels)), MAX_BARS)])
+            ends = np.append(starts[1:], len(all_labels)) - 1
+            bar_labels = [f"{all_labels[a]}-{all_labels[b][3:]}" for a, b in zip(starts, ends)]
+
+        prepared = {}
+        for metric, entries in collected.items():
+            values = np.full(len(all_labels), np.nan, dtype=np.float64)
+            cols, raw = entries
+            if cols:
+                values[np.fromiter(cols, dtype=np.intp, count=len(cols))] = \
+                    np.fromiter(raw, dtype=np.float64, count=len(raw))
+            if starts is not None:
+                # NaN-aware bucket means; buckets without any value stay NaN
+                present = ~np.isnan(values)
+                sums = np.add.reduceat(np.where(present, values, 0.0), starts)
+                counts = np.add.reduceat(present.astype(np.int64), starts)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    values = np.where(counts > 0, sums / counts, np.nan)
+            prepared[metric] = (bar_labels, values)
+        return prepared, starts is not None
+
+    def _animated_artists(self):
+        if self._bars is None:
+            return []
+        return [*self._bars, self._title]
+
+    def _on_draw(self, event):
+        """Caches the static background and paints the animated bars/title on top of it."""
+        self._bg = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        for artist in self._animated_artists():
+            self.canvas.figure.draw_artist(artist)
+
+    def resizeEvent(self, event):
+        # The cached background no longer matches the canvas; the resize redraw re-captures it
+        self._bg = None
+        super().resizeEvent(event)
 
     def update_plot(self):
         """Updates the plot according to the selected metric."""
@@ -61,36 +149,60 @@ class ChartDialog(QDialog):
         if not selected_metric or not self.data:
             return
 
-        # Prepare data for the plot
-        labels = []  # X-axis labels (IDs)
-        values = []  # Y-axis values
-
-        for row in self.data:
-            metric_val = row.get("metrics", {}).get(selected_metric)
-            if metric_val is not None:
-                try:
-                    # Only add numeric values to the plot
-                    values.append(float(metric_val))
-                    labels.append(f"ID {row.get('id', '?')}")
-                except (ValueError, TypeError):
-                    # Skip non-numeric values (e.g., True/False)
-                    continue
+        # Same metric at the same size is already on screen: nothing to redraw
+        state = (selected_metric, self.canvas.size().toTuple())
+        if state == self._plotted_state:
+            return
+
+        labels, values = self._prepared[selected_metric]
+        self._plotted_state = state
+        missing = np.isnan(values)
+        has_data = not missing.all()
+        heights = np.where(missing, 0.0, values)  # missing rows -> zero-height bars
+
+        axes = self.canvas.axes
+
+        # Fast path: the X categories are fixed, only the heights change
+        if has_data and self._bars is not None and labels is self._bar_labels:
+            old_ylim = axes.get_ylim()
+            for rect, h in zip(self._bars, heights):
+                rect.set_height(h)
+            axes.relim()
+            axes.autoscale_view(scalex=False, scaley=True)
+            self._title.set_text(f"Comparison for: {selected_metric}")
+
+            # Ticks are part of the background, so only blit while the y-range is unchanged
+            if self._bg is not None and self.canvas.supports_blit and axes.get_ylim() == old_ylim:
+                self.canvas.restore_region(self._bg)
+                for artist in self._animated_artists():
+                    self.canvas.figure.draw_artist(artist)
+                self.canvas.blit(self.canvas.figure.bbox)
+            else:
+                self.canvas.draw_idle()
+            return
 
         # Clear the current plot
-        self.canvas.axes.cla()
-        
-        if not values:
-            self.canvas.axes.text(0.5, 0.5, 'No numeric data to display for this metric.', 
-                                  horizontalalignment='center', verticalalignment='center')
-            self.canvas.draw()
+        axes.cla()
+        self._bars = None
+
+        if not has_data:
+            axes.text(0.5, 0.5, 'No numeric data to display for this metric.',
+                      horizontalalignment='center', verticalalignment='center')
+            self.canvas.draw_idle()
             return
 
         # Draw the new bar chart
-        self.canvas.axes.bar(labels, values)
-        self.canvas.axes.set_title(f"Comparison for: {selected_metric}")
-        self.canvas.axes.set_ylabel("Value")
-        self.canvas.axes.set_xlabel("Test ID")
-        self.canvas.figure.tight_layout() # Adjust layout
-        
+        self._bars = axes.bar(labels, heights, animated=True)
+        self._bar_labels = labels
+        self._title = axes.set_title(f"Comparison for: {selected_metric}", animated=True)
+        axes.set_ylabel("Value")
+        if len(labels) > MAX_BARS // 10:
+            # Too many categories to label each one: keep a sparse set of ticks
+            axes.xaxis.set_major_locator(MaxNLocator(nbins=10, integer=True))
+        if self._bucketed:
+            axes.set_xlabel("Test ID (bucket mean)")
+        else:
+            axes.set_xlabel("Test ID")
+
         # Redraw the canvas
-        self.canvas.draw()
\ No newline at end of file
+        self.canvas.draw_idle()
@@ -1,30 +1,112 @@
 # dialogs.py
-from PySide6.QtCore import Qt, QRect
-from PySide6.QtGui import QPixmap, QPainter, QPen, QColor, QMouseEvent, QFont
+from PySide6.QtCore import Qt, QRect, QObject, QRunnable, QSize, QThreadPool, QTimer, Signal
+from PySide6.QtGui import QPixmap, QPainter, QPen, QColor, QMouseEvent, QFont, QImage, QImageReader
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QWidget, QLabel
 
+
+class ImageLoaderSignals(QObject):
+    loaded = Signal(int, int, QImage, bool)  # (generation, slot index, decoded image, decoded at full size)
+    failed = Signal(int, int, str)           # (generation, slot index, reader error message)
+
+
+class ImageLoader(QRunnable):
+    """
+    Decodes an image on a QThreadPool thread, already downscaled to the display size.
+    """
+    def __init__(self, slot_idx, path, target_size: QSize, generation: int = 0):
+        super().__init__()
+        self.generation = generation  # lets the receiver drop results of superseded loads
+        self.slot_idx = slot_idx
+        self.path = path
+        self.target_size = target_size
+        self.signals = ImageLoaderSignals()
+
+    def run(self):
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(True)
+        
+        # Let the decoder produce a display-sized bitmap (never upscale)
+        src_size = reader.size()
+        full_size = True
+        if src_size.isValid() and not self.target_size.isEmpty():
+            fitted = src_size.scaled(self.target_size, Qt.KeepAspectRatio)
+            if fitted.width() < src_size.width():
+                reader.setScaledSize(fitted)
+                full_size = False
+        
+        img = reader.read()
+        if img.isNull():
+            self.signals.failed.emit(self.generation, self.slot_idx, reader.errorString())
+            return
+        # Pre-convert to the raster engine's native formats so blits need no per-frame conversion
+        fmt = QImage.Format_ARGB32_Premultiplied if img.hasAlphaChannel() else QImage.Format_RGB32
+        if img.format() != fmt:
+            img = img.convertToFormat(fmt)
+        self.signals.loaded.emit(self.generation, self.slot_idx, img, full_size)
+
+
 class BeforeAfterWidget(QWidget):
     """
     Comparison widget with Aspect Ratio preservation and Interactive Slider.
     """
-    def __init__(self, img_path1, img_path2, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        # Load images
-        self.pixmap1 = QPixmap(img_path1) # Original (Left)
-        self.pixmap2 = QPixmap(img_path2) # Candidate (Right)
+        # Images are provided later through set_pixmaps()
+        self.pixmap1 = QPixmap() # Original (Left)
+        self.pixmap2 = QPixmap() # Candidate (Right)
         
         self.split_pos = 0.5 
         self.is_dragging = False
+        self._placeholder = "Loading images..."  # shown while has_images() is False
+
+        # Coalesce slider repaints to ~60 Hz regardless of the mouse sample rate
+        self._painted_x = None  # divider x last scheduled for painting
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(16)
+        self._repaint_timer.timeout.connect(self._flush_split)
+
+        # Paint resources, built once instead of on every frame
+        self._bg_color = QColor("#1e1e1e")
+        self._pen_main = QPen(QColor(255, 255, 255, 200))
+        self._pen_main.setWidth(2)
+        self._pen_faint = QPen(QColor(255, 255, 255, 50))
+        self._pen_faint.setWidth(2)
+        self._label_color = QColor(255, 255, 255, 180) # Slightly transparent white
+        self._label_font = QFont("Arial", 9)
+        self._label_font.setBold(True)
+
+        self._layout = None  # cached (draw_w, draw_h, offset_x, offset_y)
+
+        # Pre-scaled copies of both pixmaps, keyed by (draw_w, draw_h)
+        self._scaled_cache: dict[tuple[int, int], tuple[QPixmap, QPixmap]] = {}
         
         self.setMouseTracking(True)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # 0. Clear Background (Dark Grey)
-        painter.fillRect(self.rect(), QColor("#1e1e1e"))
-        
+    def set_pixmaps(self, pixmap1, pixmap2):
+        """Sets the Original/Candidate pixmaps and repaints."""
+        self.pixmap1 = pixmap1
+        self.pixmap2 = pixmap2
+        self._layout = None
+        self._scaled_cache.clear()
+        self.update()
+
+    def set_placeholder(self, text):
+        """Replaces the text shown while no images are set (e.g. a load error)."""
+        self._placeholder = text
+        self.update()
+
+    def has_images(self):
+        return not (self.pixmap1.isNull() or self.pixmap2.isNull())
+
+    def _image_geometry(self):
+        """Returns (draw_w, draw_h, offset_x, offset_y); cached until resize or new pixmaps."""
+        if self._layout is None:
+            self._layout = self._recompute_layout()
+        return self._layout
+
+    def _recompute_layout(self):
+        """Computes the aspect-fitted image geometry for the current widget size."""
         w_widget = self.width()
         h_widget = self.height()
         
@@ -43,55 +125,92 @@ class BeforeAfterWidget(QWidget):
         # Calculate X and Y offsets to center the image
         offset_x = (w_widget - draw_w) // 2
         offset_y = (h_widget - draw_h) // 2
+        return draw_w, draw_h, offset_x, offset_y
+
+    def _labels_visible(self, divider_x, draw_w, offset_x):
+        """Which corner labels are shown for a given divider position (Original, Candidate)."""
+        w_widget = self.width()
+        return (divider_x > offset_x + 60,
+                w_widget - divider_x > (w_widget - (offset_x + draw_w)) + 70)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # Only the invalidated region is repainted (a thin strip while dragging)
+        dirty = event.rect()
+        painter.setClipRect(dirty)
         
-        # The rectangle where the image will be drawn (Target Rect)
-        target_rect = QRect(offset_x, offset_y, draw_w, draw_h)
+        # 0. Clear Background (Dark Grey)
+        painter.fillRect(dirty, self._bg_color)
+        if not self.has_images():
+            # Placeholder while the images are decoded in the background (or why they could not be)
+            painter.setPen(QColor(255, 255, 255, 120))
+            painter.drawText(self.rect(), Qt.AlignCenter, self._placeholder)
+            return
+        
+        w_widget = self.width()
+        h_widget = self.height()
+        draw_w, draw_h, offset_x, offset_y = self._image_geometry()
+        
+        # Scale once per size; slider drags only re-blit the cached bitmaps
+        scaled = self._scaled_cache.get((draw_w, draw_h))
+        if scaled is None:
+            scaled = self._scaled_cache[(draw_w, draw_h)] = (
+                self.pixmap1.scaled(draw_w, draw_h, Qt.IgnoreAspectRatio, Qt.SmoothTransformation),
+                self.pixmap2.scaled(draw_w, draw_h, Qt.IgnoreAspectRatio, Qt.SmoothTransformation),
+            )
+        scaled1, scaled2 = scaled
         
         # 1. DRAW LEFT SIDE (Original)
-        # Draw scaled version into target_rect
-        painter.drawPixmap(target_rect, self.pixmap1)
+        painter.drawPixmap(offset_x, offset_y, scaled1)
         
         # 2. DRAW RIGHT SIDE (Candidate - Clipped)
         divider_x = int(w_widget * self.split_pos)
         
         # Clip Rect (Visible Area): From slider line to the right
-        painter.setClipRect(divider_x, 0, w_widget - divider_x, h_widget)
-        painter.drawPixmap(target_rect, self.pixmap2)
-        painter.setClipping(False) # Remove mask
+        painter.save()
+        painter.setClipRect(divider_x, 0, w_widget - divider_x, h_widget, Qt.IntersectClip)
+        painter.drawPixmap(offset_x, offset_y, scaled2)
+        painter.restore() # Back to the dirty-region clip
         
         # 3. DRAW SEPARATOR LINE
         # Drawing the line only over the image area looks cleaner
         line_top = offset_y
         line_bottom = offset_y + draw_h
         
-        pen = QPen(QColor(255, 255, 255, 200))
-        pen.setWidth(2)
-        painter.setPen(pen)
-        
         # Draw line only on the image, not the full screen
         if divider_x >= offset_x and divider_x <= (offset_x + draw_w):
+            painter.setPen(self._pen_main)
             painter.drawLine(divider_x, line_top, divider_x, line_bottom)
         else:
              # If line is in the void/padding area, draw it faintly
-            pen.setColor(QColor(255, 255, 255, 50))
-            painter.setPen(pen)
+            painter.setPen(self._pen_faint)
             painter.drawLine(divider_x, 0, divider_x, h_widget)
 
-        # 4. LABELS
-        painter.setPen(QColor(255, 255, 255, 180)) # Slightly transparent white
-        font = QFont("Arial", 9) 
-        font.setBold(True)
-        painter.setFont(font)
+        # 4. LABELS (skipped when the dirty strip does not reach the label row)
+        if not dirty.intersects(QRect(offset_x, offset_y, draw_w, 30)):
+            return
+        show_orig, show_cand = self._labels_visible(divider_x, draw_w, offset_x)
+        painter.setPen(self._label_color)
+        painter.setFont(self._label_font)
         
         # Place text inside the image, in the corners
-        if divider_x > offset_x + 60: 
+        if show_orig: 
             painter.drawText(offset_x + 10, offset_y + 20, "Original")
             
-        if w_widget - divider_x > (w_widget - (offset_x + draw_w)) + 70:
+        if show_cand:
             # Align to right corner
             text_x = offset_x + draw_w - 70
             painter.drawText(text_x, offset_y + 20, "Candidate")
 
+    def resizeEvent(self, event):
+        # Only a real resize invalidates the scaled pixmaps (slider drags keep them)
+        self._scaled_cache.clear()
+        self._layout = None
+        self._painted_x = int(event.size().width() * self.split_pos)
+        super().resizeEvent(event)
+
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.LeftButton:
             self.is_dragging = True
@@ -115,9 +234,29 @@ class BeforeAfterWidget(QWidget):
             self.is_dragging = False
 
     def update_split(self, x_pos):
-        x_pos = max(0, min(x_pos, self.width()))
-        self.split_pos = x_pos / self.width()
-        self.update()
+        w = self.width()
+        x_pos = max(0, min(x_pos, w))
+        self.split_pos = x_pos / w
+        if not self._repaint_timer.isActive():
+            self._repaint_timer.start()
+
+    def _flush_split(self):
+        """Schedules the repaint for the latest split position (timer slot)."""
+        old_x = self._painted_x
+        new_x = int(self.width() * self.split_pos)
+        self._painted_x = new_x
+        if old_x is None or not self.has_images():
+            self.update()
+            return
+
+        # A label appearing/disappearing touches pixels outside the divider strip
+        draw_w, _, offset_x, _ = self._image_geometry()
+        if self._labels_visible(old_x, draw_w, offset_x) != self._labels_visible(new_x, draw_w, offset_x):
+            self.update()
+            return
+
+        # Otherwise only the band between the old and new divider (plus pen width) changed
+        self.update(QRect(min(old_x, new_x) - 2, 0, abs(new_x - old_x) + 4, self.height()))
 
 
 class ImageComparisonDialog(QDialog):
@@ -139,8 +278,74 @@ class ImageComparisonDialog(QDialog):
         lbl_info.setStyleSheet("background-color: #252526; color: #bbb; padding: 10px; border-bottom: 1px solid #3e3e42; font-size: 12px;")
         layout.addWidget(lbl_info)
         
-        # Slider Widget
-        self.slider_widget = BeforeAfterWidget(img_path1, img_path2)
+        # Slider Widget (images are decoded on first show, not here)
+        self._paths = (img_path1, img_path2)
+        self._loaded = False
+        self._generation = 0   # bumped per load; stale loader results are ignored
+        self._loaders = {}     # (generation, slot) -> ImageLoader still running
+        self._pending = 0
+        self._failed = False
+
+        # Growing the dialog re-decodes at the new size once resizing settles
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(200)
+        self._reload_timer.timeout.connect(self._reload_if_grown)
+
+        self.slider_widget = BeforeAfterWidget()
         layout.addWidget(self.slider_widget)
         
-        self.setLayout(layout)
\ No newline at end of file
+        self.setLayout(layout)
+
+    def showEvent(self, e):
+        if not self._loaded:
+            self._loaded = True
+            self._start_loading()
+        super().showEvent(e)
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        if self._loaded: self._reload_timer.start()
+
+    def _start_loading(self):
+        """Decodes both images for the current widget size; results of older loads are dropped."""
+        self._generation += 1
+        self._images = [None, None]
+        self._full_size = [False, False]
+        self._pending = len(self._paths)
+        target_size = self.slider_widget.size()
+        for idx, path in enumerate(self._paths):
+            loader = ImageLoader(idx, path, target_size, self._generation)
+            loader.signals.loaded.connect(self._on_image_loaded)
+            loader.signals.failed.connect(self._on_image_failed)
+            self._loaders[(self._generation, idx)] = loader  # referenced until its result arrives
+            QThreadPool.globalInstance().start(loader)
+
+    def _reload_if_grown(self):
+        """Re-decodes when the view outgrew the downscaled bitmaps, so enlarging never shows an upscaled blur."""
+        if self._failed or self._pending: return  # a running load re-checks when it is done
+        view = self.slider_widget.size()
+        pixmaps = (self.slider_widget.pixmap1, self.slider_widget.pixmap2)
+        for full_size, pm in zip(self._full_size, pixmaps):
+            # Width the bitmap would be drawn at now vs. the width it was decoded at
+            if not full_size and pm.size().scaled(view, Qt.KeepAspectRatio).width() > pm.width():
+                self._start_loading()
+                return
+
+    def _on_image_failed(self, generation, slot_idx, error):
+        self._loaders.pop((generation, slot_idx), None)
+        if generation != self._generation: return
+        self._failed = True
+        self._images = [None, None]
+        self.slider_widget.set_placeholder(f"Could not load image:\n{self._paths[slot_idx]}\n\n{error}")
+
+    def _on_image_loaded(self, generation, slot_idx, img, full_size):
+        self._loaders.pop((generation, slot_idx), None)
+        if generation != self._generation or self._failed: return  # superseded, or the other image failed
+        self._images[slot_idx] = img
+        self._full_size[slot_idx] = full_size
+        self._pending -= 1
+        if not self._pending:
+            self.slider_widget.set_pixmaps(QPixmap.fromImage(self._images[0]), QPixmap.fromImage(self._images[1]))
+            self._images = [None, None]
+            self._reload_if_grown()  # the dialog may have grown while decoding
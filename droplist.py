@@ -1,57 +1,129 @@
-from pathlib import Path
+import os
+from collections import Counter
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import QListWidget, QListWidgetItem, QAbstractItemView
 
+
+def _suffix_lower(path_str: str) -> str:
+    """Lower-cased suffix of a path string ('.png'), same rules as Path.suffix without building a Path."""
+    name = path_str.rpartition("/")[2].rpartition("\\")[2]
+    head, dot, ext = name.rpartition(".")
+    return "." + ext.lower() if dot and head and ext else ""
+
 class DropList(QListWidget):
     # Easiest: use signal without arguments
     filesChanged = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.allowed_ext = set()
+        self.allowed_ext: frozenset[str] = frozenset()
+        # full paths currently in the list, in list order (dict keys: O(1) lookup, insertion-ordered)
+        self._paths: dict[str, None] = {}
+        self.ext_counter: Counter[str] = Counter()  # suffix -> number of listed files with it
+        # Verdict for the drag in progress: computed in dragEnterEvent, reused by the frequent dragMoveEvents
+        self._drag_accept = False
         self.setAcceptDrops(True)
         self.setDragEnabled(False)
         self.setDropIndicatorShown(True)
         self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
 
-    def _is_allowed(self, path: Path) -> bool:
-        return (not self.allowed_ext) or (path.suffix.lower() in self.allowed_ext)
+    def set_allowed_extensions(self, exts):
+        """Restricts accepted files to these extensions (an empty iterable accepts everything)."""
+        self.allowed_ext = frozenset(e.lower() for e in exts)
+
+    @property
+    def file_paths(self) -> list[str]:
+        """Full paths of the listed files, in list order."""
+        return list(self._paths)
+
+    @property
+    def ext_set(self) -> set[str]:
+        """Suffixes ('.png', ...) of the files currently listed."""
+        return set(self.ext_counter)
+
+    def accepts(self, path_str: str) -> bool:
+        """True if a file with this name/path has an allowed extension (no filesystem access)."""
+        return (not self.allowed_ext) or (_suffix_lower(path_str) in self.allowed_ext)
+
+    def add_files(self, paths) -> int:
+        """Adds paths that are not already listed; returns the number of new items."""
+        known = self._paths
+        normpath, basename = os.path.normpath, os.path.basename
+        new_items = []
+        for p in paths:
+            sp = normpath(p)  # normalised like str(Path(p)), without a Path object per file
+            if sp not in known:
+                known[sp] = None
+                new_items.append((basename(sp), sp))
+        if not new_items:
+            return 0
+
+        self.ext_counter.update(_suffix_lower(sp) for _, sp in new_items)
+        self.ext_counter.pop("", None)
+
+        # Insert the whole batch with viewport updates suspended -> one repaint
+        self.setUpdatesEnabled(False)
+        try:
+            for name, sp in new_items:
+                it = QListWidgetItem(name)        # show file name only
+                it.setData(Qt.UserRole, sp)       # hide full path
+                self.addItem(it)
+        finally:
+            self.setUpdatesEnabled(True)
+        return len(new_items)
+
+    def remove_selected(self):
+        counter = self.ext_counter
+        # Rows from the selection model (no per-item row() scan); take bottom-up so indices stay valid
+        rows = sorted((idx.row() for idx in self.selectedIndexes()), reverse=True)
+        if not rows:
+            return
+        self.setUpdatesEnabled(False)
+        try:
+            for r in rows:
+                it = self.takeItem(r)
+                sp = it.data(Qt.UserRole)  # always set: add_files is the only way items get in
+                self._paths.pop(sp, None)
+                ext = _suffix_lower(sp)
+                if counter[ext] > 1: counter[ext] -= 1
+                else: counter.pop(ext, None)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def dragEnterEvent(self, e):
-        self._accept_if_ok(e)
+        # Every drag starts here, so the verdict is always fresh for the new payload.
+        # Extension check on the URL string only; the is_file() stat is left to dropEvent
+        md = e.mimeData()
+        self._drag_accept = md.hasUrls() and any(self.accepts(url.toLocalFile()) for url in md.urls())
+        self._apply_verdict(e)
 
     # >>> ADD: also accept during movement
     def dragMoveEvent(self, e):
-        self._accept_if_ok(e)
+        self._apply_verdict(e)
 
-    def _accept_if_ok(self, e):
-        md = e.mimeData()
-        if md.hasUrls():
-            for url in md.urls():
-                p = Path(url.toLocalFile())
-                if p.is_file() and self._is_allowed(p):
-                    e.acceptProposedAction()
-                    return
-        e.ignore()
+    def dragLeaveEvent(self, e):
+        self._drag_accept = False
+        super().dragLeaveEvent(e)
+
+    def _apply_verdict(self, e):
+        if self._drag_accept:
+            e.acceptProposedAction()
+        else:
+            e.ignore()
 
     def dropEvent(self, e):
+        self._drag_accept = False
         md = e.mimeData()
         if not md.hasUrls():
             e.ignore()
             return
-        
-        existing_paths = { self.item(i).data(Qt.UserRole) for i in range(self.count()) }
 
-        added = 0
+        candidates = []
         for url in md.urls():
-            p = Path(url.toLocalFile())
-            if p.is_file() and self._is_allowed(p):
-                sp = str(p)
-                if sp not in existing_paths:
-                    it = QListWidgetItem(p.name)      # show file name only
-                    it.setData(Qt.UserRole, sp)       # hide full path
-                    self.addItem(it)
-                    added += 1
+            local = url.toLocalFile()
+            if self.accepts(local) and os.path.isfile(local):
+                candidates.append(local)
+        added = self.add_files(candidates)
 
         if added:
             self.filesChanged.emit()    
@@ -61,8 +133,7 @@ class DropList(QListWidget):
 
     def keyPressEvent(self, e):
         if e.key() in (Qt.Key_Delete, Qt.Key_Backspace):
-            for it in self.selectedItems():
-                self.takeItem(self.row(it))
+            self.remove_selected()
             self.filesChanged.emit()
         else:
             super().keyPressEvent(e)
@@ -75,8 +146,7 @@ class DropList(QListWidget):
         actClear  = menu.addAction("Clear all")
         a = menu.exec(e.globalPos())
         if a == actRemove:
-            for it in self.selectedItems():
-                self.takeItem(self.row(it))
+            self.remove_selected()
             self.filesChanged.emit()
         elif a == actClear:
             self.clear()
@@ -84,4 +154,6 @@ class DropList(QListWidget):
 
     def clear(self):
         super().clear()
+        self._paths.clear()
+        self.ext_counter.clear()
         self.filesChanged.emit()
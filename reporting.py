@@ -10,59 +10,90 @@ import math
 import io
 import tempfile
 import os
+from os.path import basename
+from collections import Counter
 from datetime import datetime
 
 # --- Matplotlib Configuration ---
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+# Figures are drawn on an Agg canvas directly: no pyplot state, safe on the report worker thread
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 # Import helper
 from utils import fmt_val
 
+_EMPTY = {}  # shared read-only default for rows without "metrics"/"pairs"
+
 # --- CONSTANTS FOR RISK LEVELS (v3.1 Calibrated) ---
 # We observed that AI models could give approximately 60% natural "False Positives" in complex images like "Baboon".
 # Therefore, we adjusted the thresholds.
 RISK_HIGH_THRESH = 0.80  # 80% and above guaranteed STEGO
 RISK_MED_THRESH = 0.50   # 50% - 80% SUSPICIOUS (or very complex tissue)
 
+# Bucket -> (verdict label, RGB colour); thresholds are checked highest first
+_RISK_LEVELS = {
+    "Critical": ("CRITICAL / STEGO", (220, 53, 69)),         # Red
+    "Suspicious": ("SUSPICIOUS / COMPLEX", (255, 140, 0)),   # Dark Orange
+    "Safe": ("SAFE / CLEAN", (40, 167, 69)),                 # Green
+    "N/A": ("N/A", (128, 128, 128)),                         # Grey
+}
+_THRESHOLDS = ((RISK_HIGH_THRESH, "Critical"), (RISK_MED_THRESH, "Suspicious"))
+
+def _risk_bucket(s: float) -> str:
+    for thresh, bucket in _THRESHOLDS:
+        if s >= thresh: return bucket
+    return "Safe"
+
 def get_risk_level(score):
     """Returns (Level Name, Color Tuple RGB) based on score."""
-    try:
-        s = float(score)
-        if s >= RISK_HIGH_THRESH:
-            return "CRITICAL / STEGO", (220, 53, 69) # Red
-        elif s >= RISK_MED_THRESH:
-            return "SUSPICIOUS / COMPLEX", (255, 140, 0) # Dark Orange
-        else:
-            return "SAFE / CLEAN", (40, 167, 69) # Green
-    except:
-        return "N/A", (128, 128, 128) # Grey
+    try: s = float(score)
+    except: return _RISK_LEVELS["N/A"]
+    return _RISK_LEVELS[_risk_bucket(s)]
 
-def generate_risk_pie_chart(data_rows):
-    """Generates a Pie Chart showing the distribution of Risk Levels."""
-    stats = {"Safe": 0, "Suspicious": 0, "Critical": 0, "N/A": 0}
-    
-    has_data = False
+def _classify_rows(data_rows):
+    """
+    One (score, bucket) per row, shared by the pie chart and the per-row verdicts.
+    score is the AI detection score as float (None if missing/unparsable); bucket is None if the row has no score.
+    """
+    risk = []
     for row in data_rows:
-        metrics = row.get("metrics", {})
+        metrics = row.get("metrics") or _EMPTY
         # Check image or audio detection score
         score = metrics.get("image_ai_detection") or metrics.get("audio_ai_detection")
-        
-        if score is not None:
-            has_data = True
-            try:
-                s = float(score)
-                if s >= RISK_HIGH_THRESH: stats["Critical"] += 1
-                elif s >= RISK_MED_THRESH: stats["Suspicious"] += 1
-                else: stats["Safe"] += 1
-            except:
-                stats["N/A"] += 1
-        else:
-            stats["N/A"] += 1
+        if score is None:
+            risk.append((None, None))
+            continue
+        try: s = float(score)
+        except:
+            risk.append((None, "N/A"))
+            continue
+        risk.append((s, _risk_bucket(s)))
+    return risk
+
+_PIE_FIG = None
 
-    if not has_data:
+def _pie_figure():
+    """The report's pie-chart Figure, created once and cleared for every report."""
+    global _PIE_FIG
+    if _PIE_FIG is None:
+        _PIE_FIG = Figure(figsize=(6, 4))
+        FigureCanvasAgg(_PIE_FIG)
+    else:
+        _PIE_FIG.clear()
+    return _PIE_FIG
+
+def generate_risk_pie_chart(data_rows, risk=None, out=None):
+    """
+    Generates a Pie Chart showing the distribution of Risk Levels.
+    The PNG is written to out (path or binary file) if given, else to a new BytesIO; returns that target or None.
+    """
+    if risk is None: risk = _classify_rows(data_rows)
+    # Counted in C; rows without a score (bucket None) go to N/A
+    counts = Counter(bucket for _, bucket in risk)
+    if counts[None] == len(risk):  # no row has a score
         return None
+    stats = {"Safe": counts["Safe"], "Suspicious": counts["Suspicious"], "Critical": counts["Critical"],
+             "N/A": counts["N/A"] + counts[None]}
 
     # Filter out zero values for cleaner chart
     labels = [k for k, v in stats.items() if v > 0]
@@ -74,17 +105,17 @@ def generate_risk_pie_chart(data_rows):
         elif l == "Critical": colors.append('#dc3545')
         else: colors.append('#6c757d')
 
-    fig, ax = plt.subplots(figsize=(6, 4))
+    fig = _pie_figure()
+    ax = fig.add_subplot(111)
     wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct='%1.1f%%',
                                       startangle=90, colors=colors, textprops=dict(color="black"))
     ax.axis('equal') 
-    plt.title("AI Detection Distribution", fontsize=12, fontweight='bold')
-    plt.tight_layout()
+    ax.set_title("AI Detection Distribution", fontsize=12, fontweight='bold')
+    fig.tight_layout()
 
-    buf = io.BytesIO()
+    buf = io.BytesIO() if out is None else out
     fig.savefig(buf, format='png', dpi=100)
-    plt.close(fig)
-    buf.seek(0)
+    if out is None: buf.seek(0)
     return buf
 
 class PDFReport(FPDF):
@@ -115,17 +146,21 @@ def save_pdf_table(data_rows: list[dict], path: str, timestamp: str):
     pdf.cell(0, 10, "Executive Summary", ln=True)
     pdf.ln(5)
     
+    # Risk bucket of every row, classified once for the chart and the detail cards
+    risk = _classify_rows(data_rows)
+
     # 1. Embed Risk Chart (Pie Chart)
-    pie_buf = generate_risk_pie_chart(data_rows)
-    if pie_buf:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-            tmp.write(pie_buf.read())
-            tmp_path = tmp.name
-        
-        # Center image
-        x_pos = (pdf.w - 120) / 2
-        pdf.image(tmp_path, x=x_pos, w=120)
-        pdf.ln(5)
+    # fpdf 1.7 only loads images by file name, so the chart is rendered straight into the temp file
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
+        tmp_path = tmp.name
+        has_chart = generate_risk_pie_chart(data_rows, risk, tmp) is not None
+    try:
+        if has_chart:
+            # Center image
+            x_pos = (pdf.w - 120) / 2
+            pdf.image(tmp_path, x=x_pos, w=120)
+            pdf.ln(5)
+    finally:
         os.unlink(tmp_path)
     
     # 2. General Stats Table
@@ -148,14 +183,17 @@ def save_pdf_table(data_rows: list[dict], path: str, timestamp: str):
     pdf.cell(0, 10, "Detailed Test Results", ln=True)
     pdf.ln(5)
 
-    for row in data_rows:
+    # Grid labels per metric key ("image_psnr" -> ("PSNR", False)), built once for the whole report
+    labels = {}
+    col_width = 63
+
+    for row, (ai_score, bucket) in zip(data_rows, risk):
         test_id = row.get('id', '?')
-        metrics = row.get("metrics", {}) or {}
-        pairs = row.get("pairs", {}) or {}
+        metrics = row.get("metrics") or _EMPTY
+        pairs = row.get("pairs") or _EMPTY
         
-        # Determine Risk Level for this specific row
-        ai_score = metrics.get("image_ai_detection") or metrics.get("audio_ai_detection")
-        risk_label, risk_color = get_risk_level(ai_score) if ai_score is not None else ("NOT ANALYZED", (100,100,100))
+        # Risk Level for this specific row
+        risk_label, risk_color = _RISK_LEVELS[bucket] if bucket is not None else ("NOT ANALYZED", (100,100,100))
 
         # --- Test Card Header ---
         pdf.set_fill_color(240, 240, 240)
@@ -170,7 +208,7 @@ def save_pdf_table(data_rows: list[dict], path: str, timestamp: str):
         pdf.set_text_color(*risk_color)
         
         # Format Score Percentage
-        score_str = f"({float(ai_score)*100:.1f}%)" if ai_score is not None else ""
+        score_str = f"({ai_score*100:.1f}%)" if ai_score is not None else ""
         pdf.cell(0, 8, f"VERDICT: {risk_label} {score_str}", border=0, align='R', ln=True)
         pdf.set_text_color(0, 0, 0) # Reset to black
         
@@ -178,44 +216,32 @@ def save_pdf_table(data_rows: list[dict], path: str, timestamp: str):
         pdf.set_font("Arial", '', 9)
         
         type_prefix = ""
-        # Audio
-        if "audio" in pairs:
-            type_prefix = "audio"
-            orig = Path(pairs["audio"][0]).name
-            cand = Path(pairs["audio"][1]).name
-            pdf.cell(95, 6, f"Orig: {orig[:40]}", border='B')
-            pdf.cell(95, 6, f"Cand: {cand[:40]}", border='B', ln=True)
-        # Image
-        elif "image" in pairs:
-            type_prefix = "image"
-            orig = Path(pairs["image"][0]).name
-            cand = Path(pairs["image"][1]).name
-            pdf.cell(95, 6, f"Orig: {orig[:40]}", border='B')
-            pdf.cell(95, 6, f"Cand: {cand[:40]}", border='B', ln=True)
-        # Text
-        elif "text" in pairs:
-            type_prefix = "text"
-            orig = Path(pairs["text"][0]).name
-            cand = Path(pairs["text"][1]).name
-            pdf.cell(95, 6, f"Orig: {orig[:40]}", border='B')
-            pdf.cell(95, 6, f"Cand: {cand[:40]}", border='B', ln=True)
+        # First available pair, in priority order Audio > Image > Text
+        for ptype in ("audio", "image", "text"):
+            if ptype in pairs:
+                type_prefix = ptype
+                orig = basename(pairs[ptype][0])
+                cand = basename(pairs[ptype][1])
+                pdf.cell(95, 6, f"Orig: {orig[:40]}", border='B')
+                pdf.cell(95, 6, f"Cand: {cand[:40]}", border='B', ln=True)
+                break
 
         pdf.ln(2)
 
         # --- Metrics Grid ---
-        metric_keys = sorted(metrics.keys())
-        col_width = 63
-        
         pdf.set_font("Courier", '', 8) # Monospace
         
         count = 0
-        for key in metric_keys:
+        for key in sorted(metrics):
             # Skip explicit AI keys in the grid as they are in the header, 
             # BUT keep them if you want to see the raw number.
-            clean_key = key.replace("audio_", "").replace("image_", "").replace("text_", "").upper()
+            label = labels.get(key)
+            if label is None:
+                label = labels[key] = (key.replace("audio_", "").replace("image_", "").replace("text_", "").upper(),
+                                       "ai_detection" in key)
+            clean_key, is_ai = label
             
             # Highlight AI Detection in bold
-            is_ai = "ai_detection" in key
             if is_ai: pdf.set_font("Courier", 'B', 8)
             
             val = fmt_val(metrics[key])
@@ -240,14 +266,14 @@ def save_pdf_table(data_rows: list[dict], path: str, timestamp: str):
 # --- Standard Exports ---
 def _get_all_metric_keys(data_rows: list[dict]) -> list[str]:
     keys = set()
-    for row in data_rows: keys |= set((row.get("metrics") or {}).keys())
+    for row in data_rows: keys.update(row.get("metrics") or ())
     return sorted(keys)
 
 def save_txt_table(data_rows, path, timestamp):
     lines = [f"STEGANOGRAPHY REPORT v3.1 - {timestamp}", "="*60]
     for row in data_rows:
         lines.append(f"ID: {row.get('id')}")
-        for k,v in row.get("metrics", {}).items(): lines.append(f"  {k}: {fmt_val(v)}")
+        for k,v in (row.get("metrics") or _EMPTY).items(): lines.append(f"  {k}: {fmt_val(v)}")
         lines.append("-" * 20)
     Path(path).write_text("\n".join(lines), encoding="utf-8")
 
@@ -260,14 +286,14 @@ def save_json_table(data_rows, path, timestamp):
     data = {"meta": {"timestamp": timestamp, "version": "3.1"}, "results": convert_infinities(data_rows)}
     with open(path, 'w', encoding='utf-8') as f: json.dump(data, f, indent=4)
 
-def save_csv_table(data_rows, path, timestamp):
+def save_csv_table(data_rows, path, timestamp, metric_cols=None):
     if not data_rows: return
-    metric_cols = _get_all_metric_keys(data_rows)
+    if metric_cols is None: metric_cols = _get_all_metric_keys(data_rows)
     headers = ["ID"] + [h.upper() for h in metric_cols]
     with open(path, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(headers)
         for row in data_rows:
-            vals = [str(row.get("id"))]
-            for k in metric_cols: vals.append(fmt_val(row.get("metrics", {}).get(k, "")))
-            writer.writerow(vals)
\ No newline at end of file
+            # One metrics lookup per row instead of one per column
+            metrics = row.get("metrics") or _EMPTY
+            writer.writerow([str(row.get("id"))] + [fmt_val(metrics.get(k, "")) for k in metric_cols])
\ No newline at end of file
@@ -0,0 +1,73 @@
+# results_model.py
+# Table model behind the Image/Audio/Text result tabs.
+# Cells are produced on demand by data(), so only the visible viewport is ever formatted.
+
+import os
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from utils import fmt_val
+
+_EMPTY = {}
+_DASH = ("-", "-")
+
+class ResultsTableModel(QAbstractTableModel):
+    """Read-only view over the metric rows of one data type ("image", "audio" or "text")."""
+    def __init__(self, data_type: str, parent=None):
+        super().__init__(parent)
+        self.data_type = data_type
+        self._rows: list[dict] = []
+        self._metric_keys: tuple[str, ...] = ()
+        self._names: list[tuple[str, str]] = []  # (original, candidate) basenames per row
+        self._headers: list[str] = []
+
+    def setRows(self, rows: list[dict], metric_keys=None):
+        """
+        Replaces the rows; metric columns and file names are computed once here, not per cell.
+        metric_keys: union of the rows' metric keys if the caller already has it (saves a scan).
+        """
+        self.beginResetModel()
+        self._rows = rows
+        dt, basename = self.data_type, os.path.basename
+        self._names = [(basename(a), basename(b))
+                       for a, b in (r.get("pairs", _EMPTY).get(dt, _DASH) for r in rows)]
+        prefix = f"{self.data_type}_"
+        if metric_keys is None:
+            metric_keys = set()
+            for r in rows: metric_keys.update(r.get("metrics", _EMPTY))
+        self._metric_keys = tuple(sorted(k for k in metric_keys if k.startswith(prefix)))
+        self._headers = ["ID", "Original", "Candidate"] + [m.replace(prefix, "").upper() for m in self._metric_keys]
+        self.endResetModel()
+
+    def row_data(self, row: int) -> dict:
+        return self._rows[row]
+
+    def headers(self) -> list[str]:
+        return self._headers
+
+    # --- QAbstractTableModel interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row_data = self._rows[index.row()]
+        col = index.column()
+        if col == 0:
+            return str(row_data.get("id", "?"))
+        if col < 3:
+            return self._names[index.row()][col - 1]
+        metrics = row_data.get("metrics", _EMPTY)
+        key = self._metric_keys[col - 3]
+        # Missing metric -> blank cell without going through fmt_val's exception path
+        return fmt_val(metrics[key]) if key in metrics else ""
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return str(section + 1)
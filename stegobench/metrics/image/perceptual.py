@@ -17,6 +17,8 @@ Assumptions
 * LPIPS requires `lpips`, `torch`, and `torchvision`.
 """
 
+from functools import lru_cache
+from importlib.util import find_spec
 from typing import Literal
 import numpy as np
 from PIL import Image
@@ -28,12 +30,8 @@ try:
 except ImportError:
     _HAS_SSIM = False
 
-try:
-    import torch
-    import lpips
-    _HAS_LPIPS = True
-except ImportError:
-    _HAS_LPIPS = False
+# torch/lpips are only checked for here; they are imported on the first LPIPS call
+_HAS_LPIPS = find_spec("torch") is not None and find_spec("lpips") is not None
 
 
 __all__ = ["image_ssim", "image_dssim", "image_lpips"]
@@ -44,6 +42,13 @@ def _read_rgb(path: str) -> np.ndarray:
     return np.array(Image.open(path).convert("RGB"), dtype=np.float32)
 
 
+@lru_cache(maxsize=None)
+def _lpips_model(net: str):
+    """Build the LPIPS network once per backbone and process."""
+    import lpips
+    return lpips.LPIPS(net=net, verbose=False)
+
+
 def image_ssim(img_a: str, img_b: str, *, use_color: bool = False) -> float:
     """
     Compute SSIM (Structural Similarity Index) between two images.
@@ -121,6 +126,8 @@ def image_lpips(img_a: str, img_b: str, net: Literal["alex", "vgg"] = "vgg") ->
     if not _HAS_LPIPS:
         raise RuntimeError("LPIPS requires `lpips` and `torch`. Install via: pip install lpips torch torchvision")
 
+    import torch
+
     img1 = _read_rgb(img_a) / 255.0  # [0,1]
     img2 = _read_rgb(img_b) / 255.0
 
@@ -128,6 +135,7 @@ def image_lpips(img_a: str, img_b: str, net: Literal["alex", "vgg"] = "vgg") ->
     t1 = torch.tensor(img1).permute(2, 0, 1).unsqueeze(0).float()
     t2 = torch.tensor(img2).permute(2, 0, 1).unsqueeze(0).float()
 
-    loss_fn = lpips.LPIPS(net=net)
-    dist = loss_fn(t1, t2)
+    loss_fn = _lpips_model(net)
+    with torch.no_grad():
+        dist = loss_fn(t1, t2)
     return float(dist.item())
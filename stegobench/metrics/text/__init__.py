@@ -9,6 +9,9 @@ from .payload import (
     exact_match,
     char_accuracy,
     bitwise_ber,
+    exact_match_str,
+    char_accuracy_str,
+    bitwise_ber_str,
 )
 
 __all__ = [
@@ -21,4 +24,7 @@ __all__ = [
     "exact_match",
     "char_accuracy",
     "bitwise_ber",
+    "exact_match_str",
+    "char_accuracy_str",
+    "bitwise_ber_str",
 ]
@@ -10,9 +10,11 @@ Included Metrics
 - char_accuracy: Percentage of matching characters.
 - bitwise_ber: Bit Error Rate over the underlying bytes.
 
+The ``*_str`` variants take already-loaded text and never touch the filesystem.
+
 Assumptions
 -----------
-* Input can be a path to .txt file or a text string.
+* Input can be a path to .txt file or a text string (``*_str`` variants: text only).
 * Comparisons are case-sensitive unless normalized beforehand.
 """
 
@@ -23,6 +25,9 @@ __all__ = [
     "exact_match",
     "char_accuracy",
     "bitwise_ber",
+    "exact_match_str",
+    "char_accuracy_str",
+    "bitwise_ber_str",
 ]
 
 
@@ -42,7 +47,7 @@ def exact_match(original: Union[str, Path], extracted: Union[str, Path]) -> bool
     bool
         True if exact match, False otherwise.
     """
-    return _read_text(original) == _read_text(extracted)
+    return exact_match_str(_read_text(original), _read_text(extracted))
 
 
 def char_accuracy(original: Union[str, Path], extracted: Union[str, Path]) -> float:
@@ -54,13 +59,7 @@ def char_accuracy(original: Union[str, Path], extracted: Union[str, Path]) -> fl
     float
         Accuracy in [0,100].
     """
-    a = _read_text(original)
-    b = _read_text(extracted)
-    min_len = min(len(a), len(b))
-    if min_len == 0:
-        return 100.0 if len(a) == len(b) else 0.0
-    correct = sum(x == y for x, y in zip(a[:min_len], b[:min_len]))
-    return (correct / min_len) * 100.0
+    return char_accuracy_str(_read_text(original), _read_text(extracted))
 
 
 def bitwise_ber(original: Union[str, Path], extracted: Union[str, Path]) -> float:
@@ -72,8 +71,27 @@ def bitwise_ber(original: Union[str, Path], extracted: Union[str, Path]) -> floa
     float
         BER value in [0,1]. 0 = perfect match.
     """
-    a = _read_text(original).encode("utf-8", errors="ignore")
-    b = _read_text(extracted).encode("utf-8", errors="ignore")
+    return bitwise_ber_str(_read_text(original), _read_text(extracted))
+
+
+def exact_match_str(a: str, b: str) -> bool:
+    """exact_match on two loaded texts."""
+    return a == b
+
+
+def char_accuracy_str(a: str, b: str) -> float:
+    """char_accuracy on two loaded texts."""
+    min_len = min(len(a), len(b))
+    if min_len == 0:
+        return 100.0 if len(a) == len(b) else 0.0
+    correct = sum(x == y for x, y in zip(a[:min_len], b[:min_len]))
+    return (correct / min_len) * 100.0
+
+
+def bitwise_ber_str(a: str, b: str) -> float:
+    """bitwise_ber on two loaded texts."""
+    a = a.encode("utf-8", errors="ignore")
+    b = b.encode("utf-8", errors="ignore")
     min_len = min(len(a), len(b))
     if min_len == 0:
         return 1.0 if len(a) != len(b) else 0.0
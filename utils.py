@@ -1,8 +1,8 @@
 # utils.py
 import re
 import math
-from pathlib import Path
-from collections import defaultdict
+import os
+from collections import defaultdict, Counter
 import numpy as np
 import soundfile as sf
 import imagehash
@@ -19,20 +19,20 @@ from scipy.stats import entropy, skew, kurtosis
 IMG_EXT = {".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".gif", ".webp"}
 AUD_EXT = {".wav", ".flac", ".mp3"}
 TXT_EXT = {".txt", ".bin", ".log"}
+EXT_KIND = {e: "image" for e in IMG_EXT} | {e: "audio" for e in AUD_EXT} | {e: "text" for e in TXT_EXT}  # suffix -> media type
 STOP_WORDS = {"orig", "original", "stego", "extract", "audio", "image", "text", "file", "output", "test"}
+_TOKEN_SPLIT_RE = re.compile(r'[_\-\s\.]+')  # filename token separators, compiled once
 
 # --- Helper Functions ---
 def fmt_val(v) -> str:
-    try:
-        if v == float("inf"): return "inf"
-    except: pass
     if isinstance(v, int): return str(v)
-    try:
-        fval = float(v)
-        if fval == 0.0: return "0"
-        if abs(fval) < 1e-4: return f"{fval:.4e}"
-        return f"{fval:.4f}"
-    except: return str(v)
+    # Plain floats (and np.float64) skip the conversion; inf/-inf/nan fall through to the format spec
+    if not isinstance(v, float):
+        try: v = float(v)
+        except: return str(v)
+    if v == 0.0: return "0"
+    if -1e-4 < v < 1e-4: return f"{v:.4e}"
+    return f"{v:.4f}"
 
 # --- AI FEATURE EXTRACTION ENGINES ---
 
@@ -173,32 +173,46 @@ def calculate_audio_fingerprint(audio_path, duration=10):
         return fingerprint
     except: return None
     
-def get_tokens(filename: str) -> set:
-    stem = Path(filename).stem.lower()
-    tokens = set(re.split(r'[_\-\s\.]+', stem))
+def _name_parts(path_str: str):
+    """(name, lower-cased stem, lower-cased suffix) of a path string, same rules as Path.name/.stem/.suffix."""
+    name = os.path.basename(path_str)
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1: return name, name[:i].lower(), name[i:].lower()
+    return name, name.lower(), ""
+
+def _stem_tokens(stem: str) -> set:
+    tokens = set(_TOKEN_SPLIT_RE.split(stem))
     clean_tokens = {t for t in tokens if t not in STOP_WORDS and not t.isdigit() and len(t) > 2}
     return clean_tokens
 
+def get_tokens(filename: str) -> set:
+    return _stem_tokens(_name_parts(filename)[1])
+
 def group_files_smart(originals: list[str], stegos: list[str], extracts: list[str]):
     orig_entries = [] 
     for f in originals:
-        path = Path(f)
+        name, stem, suffix = _name_parts(f)
+        kind = EXT_KIND.get(suffix, 'text')
         orig_entries.append({
             'path': f,
-            'name': path.name,
-            'tokens': get_tokens(f),
-            'type': 'image' if path.suffix.lower() in IMG_EXT else 'audio' if path.suffix.lower() in AUD_EXT else 'text',
-            'fingerprint': calculate_phash(f) if path.suffix.lower() in IMG_EXT else calculate_audio_fingerprint(f) if path.suffix.lower() in AUD_EXT else None
+            'name': name,
+            'tokens': _stem_tokens(stem),
+            'type': kind,
+            'fingerprint': calculate_phash(f) if kind == 'image' else calculate_audio_fingerprint(f) if kind == 'audio' else None
         })
 
+    # Reverse index (type, token) -> positions in orig_entries, for the name-token fallback
+    token_index = defaultdict(list)
+    for i, entry in enumerate(orig_entries):
+        for tok in entry['tokens']: token_index[(entry['type'], tok)].append(i)
+
     final_refs = {"image": {}, "audio": {}, "text": {}}
     groups = defaultdict(lambda: {"stego": [], "extract": []})
     global_id_counter = 1
 
     def find_best_original(cand_path):
-        cand_p = Path(cand_path)
-        cand_suffix = cand_p.suffix.lower()
-        cand_type = 'image' if cand_suffix in IMG_EXT else 'audio' if cand_suffix in AUD_EXT else 'text'
+        _, cand_stem, cand_suffix = _name_parts(cand_path)
+        cand_type = EXT_KIND.get(cand_suffix, 'text')
         cand_fp = None
         if cand_type == 'image': cand_fp = calculate_phash(cand_path)
         elif cand_type == 'audio': cand_fp = calculate_audio_fingerprint(cand_path)
@@ -222,14 +236,12 @@ def group_files_smart(originals: list[str], stegos: list[str], extracts: list[st
                         best_score = similarity
                         best_match = entry
         if not best_match:
-            best_overlap = 0
-            cand_tokens = get_tokens(cand_path)
-            for entry in orig_entries:
-                if entry['type'] == cand_type:
-                    overlap = len(entry['tokens'] & cand_tokens)
-                    if overlap > 0 and overlap > best_overlap:
-                        best_overlap = overlap
-                        best_match = entry
+            # Overlap counts only for originals sharing at least one token; ties go to the earliest original
+            overlaps = Counter()
+            for tok in _stem_tokens(cand_stem):
+                overlaps.update(token_index.get((cand_type, tok), ()))
+            if overlaps:
+                best_match = orig_entries[min(overlaps, key=lambda i: (-overlaps[i], i))]
         return best_match
 
     for f in stegos:
@@ -3,9 +3,14 @@
 # on a background thread to keep the UI responsive.
 
 import joblib 
+import mmap
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, QRunnable, Signal
 # Import utils
 from utils import (
     group_files_smart, 
@@ -14,9 +19,6 @@ from utils import (
     calculate_gatekeeper_score
 )
 
-# Import reporting functions
-import reporting
-
 # --- StegoBench Imports ---
 # Audio
 from stegobench.metrics.audio.objective import (
@@ -46,10 +48,11 @@ from stegobench.metrics.image.payload import (
 from stegobench.metrics.text.objective import (
     text_similarity, text_levenshtein, text_jaccard
 )
+# String-only variants: _compute_group passes the loaded texts, never paths
 from stegobench.metrics.text.payload import (
-    exact_match as text_exact_match,
-    char_accuracy,
-    bitwise_ber as text_bitwise_ber,
+    exact_match_str as text_exact_match,
+    char_accuracy_str as char_accuracy,
+    bitwise_ber_str as text_bitwise_ber,
 )
 
 
@@ -91,153 +94,289 @@ METRIC_REGISTRY = {
 # --- GATEKEEPER CONSTANT ---
 AUDIO_LSB_THRESHOLD = 0.455
 
+# --- Model cache (path -> loaded model), per process ---
+_MODEL_CACHE = {}
+_MODELS_DIR = Path(__file__).parent / "models"
+_MODEL_FILES = ("stego_model_image.pkl", "stego_model_audio.pkl")  # (image, audio)
+
+def _load_model(path: Path):
+    try: mtime = os.stat(path).st_mtime_ns
+    except OSError: return None  # not cached, so a model added later is still picked up
+    key = str(path)
+    cached = _MODEL_CACHE.get(key)
+    if cached is None or cached[0] != mtime:  # a replaced model file is reloaded
+        cached = _MODEL_CACHE[key] = (mtime, joblib.load(path))
+    return cached[1]
+
+def _load_models(metrics):
+    """(image model, audio model); each file is unpickled once per process and reused across runs."""
+    if not any("ai_detection" in keys for keys in metrics.values()):
+        return None, None
+    try:
+        return tuple(_load_model(_MODELS_DIR / name) for name in _MODEL_FILES)
+    except Exception as e:
+        print(f"Model yükleme hatası: {e}")
+        # Even if there's an error, the application won't crash; the AI ​​results will simply return 0.0
+        return None, None
+
+# --- Process pool (created on first compute, kept for the whole session) ---
+_POOL = None
+
+def _get_pool():
+    global _POOL
+    if _POOL is not None and getattr(_POOL, "_broken", False):
+        _reset_pool()  # a worker died (crash/OOM kill) since the last run: start over
+    if _POOL is None:
+        # spawn everywhere (as on Windows): forking this multi-threaded Qt process can deadlock the child
+        _POOL = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2),
+                                    mp_context=multiprocessing.get_context("spawn"))
+    return _POOL
+
+def _reset_pool():
+    """Drops a broken pool so the next compute starts a fresh one."""
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+def shutdown_pool():
+    """Cancels queued groups and releases the pool (on app exit, so the process does not wait for them)."""
+    _reset_pool()
+
+# --- Row cache: (files + mtimes + metric selection [+ model mtimes]) -> computed row, for the session ---
+_ROW_CACHE = {}
+_ROW_CACHE_MAX = 4096  # oldest entries are dropped first
+
+def _model_stamps():
+    """mtime_ns of each model file (None if missing), so adding or replacing a model invalidates AI rows."""
+    stamps = []
+    for name in _MODEL_FILES:
+        try: stamps.append(os.stat(_MODELS_DIR / name).st_mtime_ns)
+        except OSError: stamps.append(None)
+    return tuple(stamps)
+
+def _row_cache_key(group_refs, data, metrics):
+    """Key for one group's row; None if a file can't be stat'ed (then the group is always recomputed)."""
+    ref_paths = tuple((t, p) for t, paths in sorted(group_refs.items()) for p in paths.values())
+    files = [p for _, p in ref_paths] + data["stego"] + data["extract"]
+    try: stamps = tuple(os.stat(p).st_mtime_ns for p in files)
+    except OSError: return None
+    selection = tuple((cat, tuple(keys)) for cat, keys in sorted(metrics.items()))
+    models = _model_stamps() if any("ai_detection" in keys for keys in metrics.values()) else None
+    return (ref_paths, tuple(data["stego"]), tuple(data["extract"]), stamps, selection, models)
+
+def _row_complete(row, metrics):
+    """False if a selected metric is missing for a pair the row has (it raised); such rows are not cached."""
+    for cat, names in metrics.items():
+        if cat not in row["pairs"]: continue
+        for name in names:
+            key = f"{cat}_{name}"
+            if (name == "ai_detection" or key in METRIC_REGISTRY) and key not in row["metrics"]:
+                return False
+    return True
+
+def _copy_row(row, gid=None):
+    return {"id": row["id"] if gid is None else gid, "metrics": dict(row["metrics"]), "pairs": dict(row["pairs"])}
+
+def _cache_row(key, row, metrics):
+    """Stores a copy of row (the original goes to the GUI) if it is complete."""
+    if not _row_complete(row, metrics): return
+    if len(_ROW_CACHE) >= _ROW_CACHE_MAX: del _ROW_CACHE[next(iter(_ROW_CACHE))]
+    _ROW_CACHE[key] = _copy_row(row)
+
+# --- Text read cache (per process): a reference shared by consecutive groups is read once ---
+# Kept tiny on purpose: entries are whole decoded files and pool processes live for the session.
+_MMAP_MIN_SIZE = 1 << 20  # files from 1 MiB up are decoded from an mmap
+
+@lru_cache(maxsize=4)
+def _read_text_cached(path: str, mtime_ns: int) -> str:
+    # Large files are decoded straight from the mapped pages, so they are not also copied into a bytes object.
+    # Newlines are then normalised the way read_text's universal-newline mode does.
+    with open(path, "rb") as f:
+        text = None
+        if os.fstat(f.fileno()).st_size >= _MMAP_MIN_SIZE:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    text = str(mm, "utf-8", "ignore")
+            except (OSError, ValueError):  # no mmap support (some FUSE/network mounts), or truncated meanwhile
+                f.seek(0)
+        if text is None: text = f.read().decode("utf-8", "ignore")
+    if "\r" in text: text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def _read_text_file(path: str) -> str:
+    return _read_text_cached(path, os.stat(path).st_mtime_ns)
+
+def _pair_metrics(prefix, names, a, b, out):
+    """Stores the registered {prefix}_{name} metrics for (a, b) in out, in selection order; failures are skipped.
+    Runs serially: parallelism comes from the process pool (one group per process), and the metrics
+    (torch LPIPS in particular) are not known to be thread-safe."""
+    for name in names:
+        if name == "ai_detection": continue
+        key = f"{prefix}_{name}"
+        if key in METRIC_REGISTRY:
+            try: out[key] = METRIC_REGISTRY[key](a, b)
+            except: pass
+
+def _compute_group(gid, data, refs, metrics):
+    """Computes every selected metric for one matched group; runs in a pool process.
+    gid is the Integer ID assigned in utils.py."""
+    img_model, aud_model = _load_models(metrics)
+    row = {"id": gid, "metrics": {}, "pairs": {}}
+    
+    # utils.py stores refs with STRING keys ("1", "2"), but groups use INT keys.
+    # We convert gid to string to look up the reference file.
+    str_gid = str(gid)
+
+    # --- Audio Metrics ---
+    # Checks if we have an original audio reference and a candidate stego file
+    if str_gid in refs["audio"] and data["stego"]:
+        ref_path = refs["audio"][str_gid]
+        cmp_path = data["stego"][0]
+        row["pairs"]["audio"] = (ref_path, cmp_path)
+        
+        # 1. Standart Metrikler (AI'yı ayrı işleyeceğiz)
+        if metrics["audio"]:
+            _pair_metrics("audio", metrics["audio"], ref_path, cmp_path, row["metrics"])
+            
+            # 2. AI & GATEKEEPER DETECTION
+            if "ai_detection" in metrics["audio"]:
+                ai_score = 0.0
+                try:
+                    # A) Gatekeeper Check (Matematiksel Kontrol)
+                    trans_rate = calculate_gatekeeper_score(cmp_path)
+                    if trans_rate > AUDIO_LSB_THRESHOLD:
+                        # LSB çok dağınık, kesin Stego. AI'ya sormaya gerek yok.
+                        ai_score = 1.0 
+                    else:
+                        # B) Dedektif Check (AI Model)
+                        if aud_model:
+                            features = extract_audio_features(cmp_path)
+                            if features is not None:
+                                # predict_proba -> [[prob_clean, prob_stego]]
+                                ai_score = aud_model.predict_proba(features)[0][1]
+                except Exception as e:
+                    print(f"Audio AI Error: {e}")
+                
+                row["metrics"]["audio_ai_detection"] = ai_score
+
+    # --- Image Metrics ---
+    # Priority: Compare Original vs Stego (common for PSNR/SSIM)
+    # If no Stego file, try Original vs Extract (common for payload extraction)
+    target_img = None
+    if data["stego"]: target_img = data["stego"][0]
+    elif data["extract"]: target_img = data["extract"][0]
+
+    if str_gid in refs["image"] and target_img:
+        ref_path = refs["image"][str_gid]
+        row["pairs"]["image"] = (ref_path, target_img)
+        
+        if metrics["image"]:
+            _pair_metrics("image", metrics["image"], ref_path, target_img, row["metrics"])
+            
+            # AI DETECTION (IMAGE)
+            if "ai_detection" in metrics["image"]:
+                ai_score = 0.0
+                try:
+                    if img_model:
+                        features = extract_image_features(target_img)
+                        if features is not None:
+                            ai_score = img_model.predict_proba(features)[0][1]
+                except Exception as e:
+                    print(f"Image AI Error: {e}")
+                
+                row["metrics"]["image_ai_detection"] = ai_score
+
+    # --- Text Metrics ---
+    target_text = None
+    if data["stego"]: target_text = data["stego"][0]
+    elif data["extract"]: target_text = data["extract"][0]
+    
+    if metrics["text"] and str_gid in refs["text"] and target_text:
+        ref_path = refs["text"][str_gid]
+        row["pairs"]["text"] = (ref_path, target_text)
+        # Read both files once; every text metric accepts the loaded strings
+        try:
+            ref_txt, cmp_txt = _read_text_file(ref_path), _read_text_file(target_text)
+        except OSError as e:
+            print(f"Error reading text pair: {e}")
+            ref_txt = cmp_txt = None
+        if ref_txt is not None:
+            for met_name in metrics["text"]:
+                metric_key = f"text_{met_name}"
+                if metric_key in METRIC_REGISTRY:
+                    try:
+                        metric_func = METRIC_REGISTRY[metric_key]
+                        row["metrics"][metric_key] = metric_func(ref_txt, cmp_txt)
+                    except Exception as e:
+                        print(f"Error calculating {metric_key}: {e}")
+    
+    return row
+
 # ---------------- Metric Worker ----------------
 class MetricWorker(QObject):
     finished = Signal(list)
     progress = Signal(int)
     error = Signal(str)
+    cancelled = Signal()
 
     def __init__(self, refs, groups, metrics):
         super().__init__()
         self.refs = refs
         self.groups = groups
         self.metrics = metrics
-        
-        # --- Load Models ---
-        self.img_model = None
-        self.aud_model = None
-        self._load_models()
-        
-    def _load_models(self):
-        """The application loads the models once when it starts."""
-        try:
-            base_path = Path(__file__).parent / "models"
-            img_model_path = base_path / "stego_model_image.pkl"
-            aud_model_path = base_path / "stego_model_audio.pkl"
-            
-            if img_model_path.exists():
-                self.img_model = joblib.load(img_model_path)
-            
-            if aud_model_path.exists():
-                self.aud_model = joblib.load(aud_model_path)
-                
-        except Exception as e:
-            print(f"Model yükleme hatası: {e}")
-            # Even if there's an error, the application won't crash; the AI ​​results will simply return 0.0
+        self._abort = False
+
+    def cancel(self):
+        """Asks a running run() to stop; checked as each group completes (safe to call from the GUI thread)."""
+        self._abort = True
 
     def run(self):
         """Calculates metrics based on ID matching from group_files_smart."""
         try:
-            data_rows = [] 
             total_groups = len(self.groups)
             if total_groups == 0:
                 self.progress.emit(100)
                 self.finished.emit([])
                 return
 
-            # gid is the Integer ID assigned in utils.py
-            for i, (gid, data) in enumerate(sorted(self.groups.items())):
-                row = {"id": gid, "metrics": {}, "pairs": {}}
-                
-                # utils.py stores refs with STRING keys ("1", "2"), but groups use INT keys.
-                # We convert gid to string to look up the reference file.
-                str_gid = str(gid)
-
-                # --- Audio Metrics ---
-                # Checks if we have an original audio reference and a candidate stego file
-                if str_gid in self.refs["audio"] and data["stego"]:
-                    ref_path = self.refs["audio"][str_gid]
-                    cmp_path = data["stego"][0]
-                    row["pairs"]["audio"] = (ref_path, cmp_path)
-                    
-                    # 1. Standart Metrikler
-                    if self.metrics["audio"]:
-                        for met_name in self.metrics["audio"]:
-                            if met_name == "ai_detection": continue # AI'yı ayrı işleyeceğiz
-                            
-                            key = f"audio_{met_name}"
-                            if key in METRIC_REGISTRY:
-                                try:
-                                    row["metrics"][key] = METRIC_REGISTRY[key](ref_path, cmp_path)
-                                except: pass
-                        
-                        # 2. AI & GATEKEEPER DETECTION
-                        if "ai_detection" in self.metrics["audio"]:
-                            ai_score = 0.0
-                            try:
-                                # A) Gatekeeper Check (Matematiksel Kontrol)
-                                trans_rate = calculate_gatekeeper_score(cmp_path)
-                                if trans_rate > AUDIO_LSB_THRESHOLD:
-                                    # LSB çok dağınık, kesin Stego. AI'ya sormaya gerek yok.
-                                    ai_score = 1.0 
-                                else:
-                                    # B) Dedektif Check (AI Model)
-                                    if self.aud_model:
-                                        features = extract_audio_features(cmp_path)
-                                        if features is not None:
-                                            # predict_proba -> [[prob_clean, prob_stego]]
-                                            ai_score = self.aud_model.predict_proba(features)[0][1]
-                            except Exception as e:
-                                print(f"Audio AI Error: {e}")
-                            
-                            row["metrics"]["audio_ai_detection"] = ai_score
-
-                # --- Image Metrics ---
-                # Priority: Compare Original vs Stego (common for PSNR/SSIM)
-                # If no Stego file, try Original vs Extract (common for payload extraction)
-                target_img = None
-                if data["stego"]: target_img = data["stego"][0]
-                elif data["extract"]: target_img = data["extract"][0]
-
-                if str_gid in self.refs["image"] and target_img:
-                    ref_path = self.refs["image"][str_gid]
-                    row["pairs"]["image"] = (ref_path, target_img)
-                    
-                    if self.metrics["image"]:
-                        for met_name in self.metrics["image"]:
-                            if met_name == "ai_detection": continue
-                            
-                            key = f"image_{met_name}"
-                            if key in METRIC_REGISTRY:
-                                try:
-                                    row["metrics"][key] = METRIC_REGISTRY[key](ref_path, target_img)
-                                except: pass
-                        
-                        # AI DETECTION (IMAGE)
-                        if "ai_detection" in self.metrics["image"]:
-                            ai_score = 0.0
-                            try:
-                                if self.img_model:
-                                    features = extract_image_features(target_img)
-                                    if features is not None:
-                                        ai_score = self.img_model.predict_proba(features)[0][1]
-                            except Exception as e:
-                                print(f"Image AI Error: {e}")
-                            
-                            row["metrics"]["image_ai_detection"] = ai_score
-
-                # --- Text Metrics ---
-                target_text = None
-                if data["stego"]: target_text = data["stego"][0]
-                elif data["extract"]: target_text = data["extract"][0]
-                
-                if self.metrics["text"] and str_gid in self.refs["text"] and target_text:
-                    ref_path = self.refs["text"][str_gid]
-                    row["pairs"]["text"] = (ref_path, target_text)
-                    for met_name in self.metrics["text"]:
-                        metric_key = f"text_{met_name}"
-                        if metric_key in METRIC_REGISTRY:
-                            try:
-                                metric_func = METRIC_REGISTRY[metric_key]
-                                row["metrics"][metric_key] = metric_func(ref_path, target_text)
-                            except Exception as e:
-                                print(f"Error calculating {metric_key}: {e}")
-                
-                data_rows.append(row)
-                progress_percent = int(((i + 1) / total_groups) * 100)
-                self.progress.emit(progress_percent)
+            # Groups are independent -> one pool task each; the pool outlives this run.
+            # Each task only gets its own reference paths, not the whole refs table.
+            # Groups whose files and metric selection are unchanged since an earlier run reuse that row.
+            pool = _get_pool()
+            rows = [None] * total_groups
+            pending = {}  # future -> (slot in rows, cache key)
+            done = 0
+            # submit() raises too if a pool process died since the last run, so it shares the reset handler
+            try:
+                for slot, (gid, data) in enumerate(sorted(self.groups.items())):
+                    str_gid = str(gid)
+                    group_refs = {t: ({str_gid: paths[str_gid]} if str_gid in paths else {}) for t, paths in self.refs.items()}
+                    key = _row_cache_key(group_refs, data, self.metrics)
+                    cached = _ROW_CACHE.get(key) if key else None
+                    if cached is not None:
+                        rows[slot] = _copy_row(cached, gid)
+                        done += 1
+                    else:
+                        pending[pool.submit(_compute_group, gid, data, group_refs, self.metrics)] = (slot, key)
+                if done: self.progress.emit(int((done / total_groups) * 100))
 
-            self.finished.emit(data_rows)
+                for fut in as_completed(pending):
+                    if self._abort:
+                        # Queued groups are dropped; groups already running finish in the pool and are discarded
+                        for f in pending: f.cancel()
+                        self.cancelled.emit()
+                        return
+                    slot, key = pending[fut]
+                    rows[slot] = fut.result()
+                    if key: _cache_row(key, rows[slot], self.metrics)
+                    done += 1
+                    self.progress.emit(int((done / total_groups) * 100))
+            except BrokenProcessPool:
+                _reset_pool()
+                raise
+
+            self.finished.emit(rows)
 
         except Exception as e:
             self.error.emit(str(e))
@@ -247,15 +386,18 @@ class ReportWorker(QObject):
     finished = Signal(str)  # When the job is finished, it returns the file path
     error = Signal(str)     # If an error occurs, it returns an error message.
 
-    def __init__(self, data_rows, path, timestamp):
+    def __init__(self, data_rows, path, timestamp, metric_cols=None):
         super().__init__()
         self.data_rows = data_rows
         self.path = path
         self.timestamp = timestamp
+        self.metric_cols = metric_cols  # sorted metric keys, if the caller already has them
 
     def run(self):
         """Generates the report in the background."""
         try:
+            # Imported here: reporting pulls in fpdf + matplotlib, which the pool processes never need
+            import reporting
             # Select the correct reporting function based on the file extension
             if self.path.endswith('.pdf'):
                 reporting.save_pdf_table(self.data_rows, self.path, self.timestamp)
@@ -264,10 +406,20 @@ class ReportWorker(QObject):
             elif self.path.endswith('.json'):
                 reporting.save_json_table(self.data_rows, self.path, self.timestamp)
             elif self.path.endswith('.csv'):
-                reporting.save_csv_table(self.data_rows, self.path, self.timestamp)
+                reporting.save_csv_table(self.data_rows, self.path, self.timestamp, self.metric_cols)
             else:
                 raise ValueError("Unsupported file extension selected.")
             
             self.finished.emit(self.path)
         except Exception as e:
-            self.error.emit(str(e))
\ No newline at end of file
+            self.error.emit(str(e))
+
+# ---------------- Pool Runner ----------------
+class WorkerRunner(QRunnable):
+    """Runs a worker's run() on a QThreadPool thread; the worker keeps its own signals."""
+    def __init__(self, worker):
+        super().__init__()
+        self.worker = worker
+
+    def run(self):
+        self.worker.run()